@@ -1,6 +1,10 @@
 import sqlite3
 import logging
-from typing import Optional, List, Tuple, Dict
+from typing import Optional, Iterator, List, Tuple, Dict
+
+# INSERT ... ON CONFLICT ... RETURNING needs SQLite 3.35+; older versions
+# fall back to the two-statement SELECT-then-UPDATE/INSERT path.
+_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35)
 
 
 class Database:
@@ -19,11 +23,30 @@ class Database:
                 check_same_thread=False  # Allow multiple threads to use the connection
             )
             self.cursor = self.conn.cursor()
+            self._apply_pragmas()
             self.logger.info(f"Connected to database: {self.db_name} (shared cache mode enabled)")
         except sqlite3.Error as e:
             self.logger.error(f"Error connecting to database: {e}")
             raise
 
+    def _apply_pragmas(self) -> None:
+        """Tune SQLite for the write-heavy scraper workload.
+
+        WAL mode with synchronous=NORMAL avoids an fsync on every commit,
+        and the larger page cache / mmap keep hot B-tree pages in memory.
+        These settings live on the single long-lived connection, so they
+        persist for the whole run.
+        """
+        self.cursor.execute("PRAGMA journal_mode=WAL")
+        journal_mode = self.cursor.fetchone()[0]
+        if journal_mode.lower() != "wal":
+            self.logger.warning(f"Could not enable WAL mode, journal_mode is '{journal_mode}'")
+        self.cursor.execute("PRAGMA synchronous=NORMAL")
+        self.cursor.execute("PRAGMA temp_store=MEMORY")
+        self.cursor.execute("PRAGMA cache_size=-65536")  # ~64 MiB page cache
+        self.cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB memory-mapped I/O
+        self.cursor.execute("PRAGMA foreign_keys=ON")
+
     def initialize_schema(self) -> None:
         """Create tables if they don't exist."""
         schema_statements = [
@@ -79,16 +102,32 @@ class Database:
     def save_movie(self, title: str, genre: str, description: str, year: int, countries: str) -> Optional[int]:
         """Save movie details to the database."""
         try:
-            self.cursor.execute("SELECT id FROM movies WHERE title = ? AND year = ?", (title, year))
-            movie = self.cursor.fetchone()
-
-            if movie:
-                movie_id = movie[0]
-                self._update_movie(movie_id, genre, description, countries)
-                self.logger.info(f"Updated existing movie: {title} ({year})")
+            if _SUPPORTS_RETURNING:
+                # Single upsert instead of SELECT + UPDATE/INSERT: one
+                # statement prep and no extra round-trip for the id.
+                self.cursor.execute('''
+                    INSERT INTO movies (title, genre, description, year, countries)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(title, year) DO UPDATE SET
+                        genre = excluded.genre,
+                        description = excluded.description,
+                        countries = excluded.countries,
+                        last_updated = CURRENT_TIMESTAMP
+                    RETURNING id
+                ''', (title, genre, description, year, countries))
+                movie_id = self.cursor.fetchone()[0]
+                self.logger.info(f"Saved movie: {title} ({year})")
             else:
-                movie_id = self._insert_movie(title, genre, description, year, countries)
-                self.logger.info(f"Inserted new movie: {title} ({year})")
+                self.cursor.execute("SELECT id FROM movies WHERE title = ? AND year = ?", (title, year))
+                movie = self.cursor.fetchone()
+
+                if movie:
+                    movie_id = movie[0]
+                    self._update_movie(movie_id, genre, description, countries)
+                    self.logger.info(f"Updated existing movie: {title} ({year})")
+                else:
+                    movie_id = self._insert_movie(title, genre, description, year, countries)
+                    self.logger.info(f"Inserted new movie: {title} ({year})")
 
             self.conn.commit()
             return movie_id
@@ -96,33 +135,121 @@ class Database:
             self.logger.error(f"Error saving movie {title} ({year}): {e}")
             return None
 
+    def save_movies_bulk(self, records: List[Tuple[str, str, str, int, str]]) -> None:
+        """Upsert many movies in a single transaction.
+
+        Each record is a (title, genre, description, year, countries) tuple.
+        """
+        if not records:
+            return
+
+        try:
+            self.conn.execute("BEGIN")
+            self.cursor.executemany('''
+                INSERT INTO movies (title, genre, description, year, countries)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(title, year) DO UPDATE SET
+                    genre = excluded.genre,
+                    description = excluded.description,
+                    countries = excluded.countries,
+                    last_updated = CURRENT_TIMESTAMP
+            ''', records)
+            self.conn.commit()
+            self.logger.info(f"Saved {len(records)} movies in bulk")
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            self.logger.error(f"Error bulk-saving movies: {e}")
+
+    def bulk_ingest(self, records: List[Tuple[str, str, str, int, str, Dict[str, List[str]]]]) -> None:
+        """Upsert movies and all their screenings in a single transaction.
+
+        Each record is a (title, genre, description, year, countries,
+        screenings) tuple, where screenings maps a date to its times.
+        One commit for the whole run instead of two per movie.
+        """
+        if not records:
+            return
+
+        try:
+            self.conn.execute("BEGIN")
+            screening_rows = []
+            for title, genre, description, year, countries, screenings in records:
+                if _SUPPORTS_RETURNING:
+                    self.cursor.execute('''
+                        INSERT INTO movies (title, genre, description, year, countries)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(title, year) DO UPDATE SET
+                            genre = excluded.genre,
+                            description = excluded.description,
+                            countries = excluded.countries,
+                            last_updated = CURRENT_TIMESTAMP
+                        RETURNING id
+                    ''', (title, genre, description, year, countries))
+                    movie_id = self.cursor.fetchone()[0]
+                else:
+                    self.cursor.execute("SELECT id FROM movies WHERE title = ? AND year = ?", (title, year))
+                    movie = self.cursor.fetchone()
+                    if movie:
+                        movie_id = movie[0]
+                        self._update_movie(movie_id, genre, description, countries)
+                    else:
+                        movie_id = self._insert_movie(title, genre, description, year, countries)
+
+                screening_rows.extend(
+                    (movie_id, screening_date, screening_time)
+                    for screening_date, screening_times in screenings.items()
+                    for screening_time in screening_times
+                )
+
+            if screening_rows:
+                self.cursor.executemany('''
+                    INSERT OR IGNORE INTO screenings (movie_id, screening_date, screening_time)
+                    VALUES (?, ?, ?)
+                ''', screening_rows)
+            self.conn.commit()
+            self.logger.info(f"Ingested {len(records)} movies and {len(screening_rows)} screenings in one transaction")
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            self.logger.error(f"Error bulk-ingesting movies: {e}")
+
     def save_screenings(self, movie_id: int, screenings: Dict[str, List[str]]) -> None:
         """Save movie screenings to the database."""
         if not movie_id:
             self.logger.error(f"Invalid movie ID: {movie_id}")
             return
 
-        try:
-            for screening_date, screening_times in screenings.items():
-                for screening_time in screening_times:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO screenings (movie_id, screening_date, screening_time)
-                        VALUES (?, ?, ?)
-                    ''', (movie_id, screening_date, screening_time))
+        rows = [
+            (movie_id, screening_date, screening_time)
+            for screening_date, screening_times in screenings.items()
+            for screening_time in screening_times
+        ]
+        if not rows:
+            return
 
+        try:
+            # One transaction for the whole batch: a single statement prep
+            # and a single commit instead of one per (date, time) pair.
+            self.conn.execute("BEGIN")
+            self.cursor.executemany('''
+                INSERT OR IGNORE INTO screenings (movie_id, screening_date, screening_time)
+                VALUES (?, ?, ?)
+            ''', rows)
             self.conn.commit()
             self.logger.info(f"Screenings saved for movie ID {movie_id}")
         except sqlite3.Error as e:
+            self.conn.rollback()
             self.logger.error(f"Error saving screenings for movie ID {movie_id}: {e}")
 
-    def fetch_movie_titles_and_years(self) -> List[Tuple[str, int]]:
-        """Retrieve movie title and production year from the database."""
+    def fetch_movie_titles_and_years(self) -> Iterator[Tuple[str, int]]:
+        """Stream movie title and production year rows from the database."""
         try:
             self.cursor.execute("SELECT title, year FROM movies")
-            return self.cursor.fetchall()
+            # Yield rows straight off the cursor instead of materializing
+            # a fetchall() list; callers only build sets from this.
+            return iter(self.cursor)
         except sqlite3.Error as e:
             self.logger.error(f"Error fetching movies: {e}")
-            return []
+            return iter(())
 
     def close(self) -> None:
         """Close the database connection."""
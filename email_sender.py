@@ -4,8 +4,8 @@ from dotenv import load_dotenv
 from datetime import datetime, timedelta
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import List, Dict, Any
-from jinja2 import Environment, FileSystemLoader
+from typing import List, Dict, Any, Optional
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,7 +18,48 @@ class EmailSender:
         self.sender_email: str = os.getenv("SENDER_EMAIL")
         self.sender_password: str = os.getenv("SENDER_PASSWORD")
         self.recipient_emails: List[str] = self._load_emails_from_file(emails_file)
-        self.template_env = Environment(loader=FileSystemLoader(searchpath="templates"))
+        # Compile the template once up front; the bytecode cache persists
+        # compiled templates across runs (the template never changes mid-run,
+        # so auto_reload is off).
+        self.template_env = Environment(
+            loader=FileSystemLoader(searchpath="templates"),
+            bytecode_cache=FileSystemBytecodeCache(),
+            auto_reload=False
+        )
+        self._template = self.template_env.get_template("email_template.html")
+        # Lazily-opened SMTP connection, reused across send_email calls
+        self._server: Optional[smtplib.SMTP] = None
+
+    def __enter__(self) -> "EmailSender":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _get_server(self) -> smtplib.SMTP:
+        """Return a connected, logged-in SMTP session, reconnecting if the old one died."""
+        if self._server is not None:
+            try:
+                self._server.noop()  # cheap keep-alive check
+                return self._server
+            except smtplib.SMTPException:
+                self.close()
+
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        server.ehlo()  # Send EHLO to the server (identify yourself)
+        server.starttls()  # Encrypt the connection
+        server.login(self.sender_email, self.sender_password)
+        self._server = server
+        return server
+
+    def close(self) -> None:
+        """Close the persistent SMTP connection, if open."""
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except smtplib.SMTPException:
+                pass
+            self._server = None
 
     @staticmethod
     def get_today_and_end_date(days_ahead: int) -> tuple:
@@ -30,41 +71,49 @@ class EmailSender:
     def _load_emails_from_file(file_path: str) -> List[str]:
         """Load emails from a text file and return as a list."""
         try:
-            with open(file_path, "r") as file:
-                emails = file.readlines()
-            # Clean up the list (strip extra whitespace or newlines)
-            return [email.strip() for email in emails if email.strip()]
+            # Iterate the file object directly: one pass, no intermediate
+            # readlines() list. The larger buffer cuts read syscalls.
+            with open(file_path, "r", encoding="utf-8", buffering=65536) as file:
+                return [email.strip() for email in file if email.strip()]
         except FileNotFoundError:
             print(f"Error: The file '{file_path}' was not found.")
             return []
 
-    def create_email(self, movie_details: List[Dict[str, Any]], days: int, recipient_email: str) -> MIMEMultipart:
-        """Create an email message with the movie details."""
+    def create_email(self, movie_details: List[Dict[str, Any]], days: int) -> MIMEMultipart:
+        """Create the email message shared by all recipients (the To header is filled per send)."""
         today, end_date = self.get_today_and_end_date(days)
-        template = self.template_env.get_template("email_template.html")
-        body = template.render(today=today.strftime('%Y-%m-%d'), end_date=end_date.strftime('%Y-%m-%d'), movie_details=movie_details)
+        body = self._template.render(today=today.strftime('%Y-%m-%d'), end_date=end_date.strftime('%Y-%m-%d'), movie_details=movie_details)
 
         message = MIMEMultipart()
         message["From"] = self.sender_email
-        message["To"] = recipient_email
+        message["To"] = ""  # set per recipient in send_email
         message["Subject"] = f"Repertuar nowych filmów na {today.strftime('%Y-%m-%d')} - {end_date.strftime('%Y-%m-%d')}"
         message.attach(MIMEText(body, "html"))
         return message
 
     def send_email(self, movie_details: List[Dict[str, Any]], num_days: int) -> None:
         """Compose and send the email with subject and body."""
-        for recipient_email in self.recipient_emails:
-            message = self.create_email(movie_details, days=num_days, recipient_email=recipient_email)
-            try:
-                # Connect to the SMTP server
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                    server.ehlo()  # Send EHLO to the server (identify yourself)
-                    server.starttls()  # Encrypt the connection
-                    server.login(self.sender_email, self.sender_password)
+        if not self.recipient_emails:
+            return
 
-                    # Send the email
-                    server.sendmail(self.sender_email, recipient_email, message.as_string())
-                    print(f"Email sent successfully to {recipient_email}!")
+        # The body is identical for every recipient: render it once and
+        # reuse the persistent SMTP session instead of a handshake per send.
+        message = self.create_email(movie_details, days=num_days)
+        try:
+            server = self._get_server()
+        except Exception as e:
+            print(f"Error connecting to SMTP server: {e}")
+            return
 
+        for recipient_email in self.recipient_emails:
+            message.replace_header("To", recipient_email)
+            try:
+                try:
+                    server.sendmail(self.sender_email, [recipient_email], message.as_string())
+                except smtplib.SMTPServerDisconnected:
+                    # The server dropped the idle connection; reconnect and retry once
+                    server = self._get_server()
+                    server.sendmail(self.sender_email, [recipient_email], message.as_string())
+                print(f"Email sent successfully to {recipient_email}!")
             except Exception as e:
                 print(f"Error sending email to {recipient_email}: {e}")
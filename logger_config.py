@@ -1,66 +1,89 @@
-import logging
-from typing import Optional
-
-
-def configure_logger(name: str, log_file: str = "app.log", level: int = logging.INFO) -> logging.Logger:
-    """
-    Configures and returns a logger for file output
-
-    Args:
-        name (str): Name of the logger (usually the module/class name).
-        log_file (str): Path to the log file.
-        level (int): Logging level (e.g., logging.INFO, logging.DEBUG).
-
-    Returns:
-        logging.Logger: Configured logger instance for file output.
-    """
-    logger = logging.getLogger(name)
-
-    # Avoid duplicate handlers, and remove existing ones if any
-    if logger.hasHandlers():
-        logger.handlers.clear()
-
-    file_handler = logging.FileHandler(log_file)
-
-    file_handler.setFormatter(logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    ))
-
-    # Add handler to logger
-    logger.addHandler(file_handler)
-    logger.setLevel(level)
-
-    return logger
-
-
-def configure_movie_logger(name: str, log_file: str = "app.log", level: int = logging.INFO) -> logging.Logger:
-    """
-    Configures and returns a logger for file output
-
-    Args:
-        name (str): Name of the logger (usually the module/class name).
-        log_file (str): Path to the log file.
-        level (int): Logging level (e.g., logging.INFO, logging.DEBUG).
-
-    Returns:
-        logging.Logger: Configured logger instance for file output.
-    """
-    logger = logging.getLogger(name)
-
-    # Avoid duplicate handlers, and remove existing ones if any
-    if logger.hasHandlers():
-        logger.handlers.clear()
-
-    file_handler = logging.FileHandler(log_file, encoding="utf-8")
-
-    file_handler.setFormatter(logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    ))
-
-    # Add handler to logger
-    logger.addHandler(file_handler)
-    logger.setLevel(level)
-
-    return logger
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+# One background listener (and file handle) per log file. Loggers on the
+# hot path only enqueue records; the listener thread does the file I/O.
+_listeners: Dict[str, QueueListener] = {}
+
+
+def _get_queue_handler(log_file: str, encoding: Optional[str] = None) -> QueueHandler:
+    """
+    Returns a QueueHandler whose background listener writes to the given file
+
+    Args:
+        log_file (str): Path to the log file.
+        encoding (Optional[str]): Encoding for the underlying file handler.
+
+    Returns:
+        QueueHandler: Handler that enqueues records for the file's listener.
+    """
+    if log_file not in _listeners:
+        log_queue: "queue.Queue" = queue.Queue(-1)
+
+        file_handler = logging.FileHandler(log_file, encoding=encoding)
+        file_handler.setFormatter(logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S"
+        ))
+
+        listener = QueueListener(log_queue, file_handler)
+        listener.start()
+        # Flush and stop the listener thread on interpreter shutdown
+        # (guarded so an earlier manual stop() is harmless)
+        atexit.register(lambda: listener._thread and listener.stop())
+        _listeners[log_file] = listener
+
+    return QueueHandler(_listeners[log_file].queue)
+
+
+def configure_logger(name: str, log_file: str = "app.log", level: int = logging.INFO) -> logging.Logger:
+    """
+    Configures and returns a logger for file output
+
+    Args:
+        name (str): Name of the logger (usually the module/class name).
+        log_file (str): Path to the log file.
+        level (int): Logging level (e.g., logging.INFO, logging.DEBUG).
+
+    Returns:
+        logging.Logger: Configured logger instance for file output.
+    """
+    logger = logging.getLogger(name)
+
+    # Avoid duplicate handlers, and remove existing ones if any
+    if logger.hasHandlers():
+        logger.handlers.clear()
+
+    # Add handler to logger; writes happen on the listener thread
+    logger.addHandler(_get_queue_handler(log_file))
+    logger.setLevel(level)
+
+    return logger
+
+
+def configure_movie_logger(name: str, log_file: str = "app.log", level: int = logging.INFO) -> logging.Logger:
+    """
+    Configures and returns a logger for file output
+
+    Args:
+        name (str): Name of the logger (usually the module/class name).
+        log_file (str): Path to the log file.
+        level (int): Logging level (e.g., logging.INFO, logging.DEBUG).
+
+    Returns:
+        logging.Logger: Configured logger instance for file output.
+    """
+    logger = logging.getLogger(name)
+
+    # Avoid duplicate handlers, and remove existing ones if any
+    if logger.hasHandlers():
+        logger.handlers.clear()
+
+    # Add handler to logger; writes happen on the listener thread
+    logger.addHandler(_get_queue_handler(log_file, encoding="utf-8"))
+    logger.setLevel(level)
+
+    return logger
@@ -1,18 +1,23 @@
 #!/usr/bin/env python3
-import json
+import asyncio
 import logging
-import requests
 import re
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+import aiohttp
+import orjson
+from selectolax.parser import HTMLParser, Node
 from logger_config import configure_logger, configure_movie_logger
 from email_sender import EmailSender
 from database import Database
-from typing import Dict, List, Tuple, Union
+from typing import Dict, Iterator, List, Set, Tuple, Union
 
 # Define the base URL as a module-level constant
 BASE_URL = "https://www.kinonh.pl/"
 
+# Precompiled patterns for the per-movie text cleanup helpers
+_YEAR_RE = re.compile(r'(\d{4})\s*$')
+_GENRE_RE = re.compile(r'(?:.*?gatunek:)?\s*(?P<genre>.*?)\s*(?:kategoria wiekowa:|czas trwania:|$)', re.S)
+
 
 class KinoScraper:
     def __init__(self, base_url: str = BASE_URL, db_name: str = "movies.db") -> None:
@@ -22,6 +27,8 @@ class KinoScraper:
                           "Chrome/114.0.0.0 Safari/537.36"
         }
         self.movies: Dict[str, Dict[str, Union[str, Dict[str, List[str]]]]] = {}
+        # Detail pages already fetched this run, keyed by URL
+        self._page_cache: Dict[str, bytes] = {}
         # Configure logging for this class
         self.logger = configure_logger(
             self.__class__.__name__,
@@ -47,153 +54,219 @@ class KinoScraper:
         self.logger.debug(f"Fetching movies for dates: {dates}")
         return dates
 
-    def _get_existing_movies(self) -> List[Tuple[str, int]]:
-        """Retrieve all movie titles and years already stored in the database."""
+    def _get_existing_movies(self) -> Iterator[Tuple[str, int]]:
+        """Stream the movie titles and years already stored in the database."""
         return self.db.fetch_movie_titles_and_years()
 
-    def _fetch_movies_page(self, formatted_date: str) -> Union[Dict[str, str], None]:
+    async def _afetch(self, session: aiohttp.ClientSession, url: str) -> Union[bytes, None]:
+        """Fetch a URL and return the raw response body, or None on failure."""
+        try:
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.read()
+                self.logger.error(f"Failed to fetch {url}. Status code: {response.status}")
+                return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Degrade to a skipped page: an exception escaping here would
+            # cancel every sibling fetch in the gather and lose the run.
+            self.logger.error(f"Failed to fetch {url}: {e}")
+            return None
+
+    async def _fetch_movies_page(self, session: aiohttp.ClientSession, formatted_date: str) -> Union[str, None]:
         """Fetch the movies page for a given date."""
         url_for_json = f"{self.base_url}/rep.json?dzien={formatted_date}"
         self.logger.info(f"Fetching movies page for date: {formatted_date}")
-        response = requests.get(url_for_json, headers=self.headers)
-        if response.status_code == 200:
-            self.logger.info(f"Successfully fetched movies page for date: {formatted_date}")
-            return response.json().get("lista", "")  # default value if the key doesn't exist
-        else:
-            self.logger.error(f"Failed to fetch movies page. Status code: {response.status_code}")
+        body = await self._afetch(session, url_for_json)
+        if body is None:
             return None
+        self.logger.info(f"Successfully fetched movies page for date: {formatted_date}")
+        return orjson.loads(body).get("lista", "")  # default value if the key doesn't exist
 
-    def _parse_movies(self, formatted_date: str) -> None:
+    async def _parse_movies(self, session: aiohttp.ClientSession, formatted_date: str,
+                            existing_titles: Set[str]) -> None:
         """Parse the movies for a given date."""
-        existing_movies = self._get_existing_movies()
-
-        raw_html = self._fetch_movies_page(formatted_date)
+        raw_html = await self._fetch_movies_page(session, formatted_date)
         if not raw_html:
             self.logger.debug(f"Cannot fetch the movie page for {formatted_date}")
             return
 
         self.logger.info(f"Parsing movies for {formatted_date}...")
-        soup = BeautifulSoup(raw_html, 'html.parser')
-        for event in soup.find_all('div', class_='pastyt'):
-            title_tag = event.find('a', class_='tyt')
+        # Tree construction is CPU-heavy; keep it off the event loop.
+        loop = asyncio.get_running_loop()
+        tree = await loop.run_in_executor(None, HTMLParser, raw_html)
+        for event in tree.css('div.pastyt'):
+            title_tag = event.css_first('a.tyt')
             if title_tag:
-                title = title_tag.text.strip()
-                link = f"{self.base_url}{title_tag['href']}"
+                title = title_tag.text().strip()
+                link = f"{self.base_url}{title_tag.attributes.get('href', '')}"
 
                 # Check if the movie is already in the database
-                if any(movie[0] == title for movie in existing_movies):
+                if title in existing_titles:
                     self.logger.info(f"Movie '{title}' already exists in the database")
                     continue  # skip this movie if in database
 
                 # Find the screening times
-                times_div = event.find_next_sibling('div', class_='seanserep')
-                screening_times = [a.text.strip() for a in times_div.find_all('a', class_='xseans')] if times_div else []
+                times_div = self._next_sibling_div(event, 'seanserep')
+                screening_times = [a.text().strip() for a in times_div.css('a.xseans')] if times_div else []
 
                 if title not in self.movies:
                     self.movies[title] = {"title": title, "link": link, "screenings": {}}
                 self.movies[title]["screenings"][formatted_date] = screening_times
                 self.logger.debug(f"Parsed movie: {title} for {formatted_date}")
 
+    @staticmethod
+    def _next_sibling_div(node: Node, class_name: str) -> Union[Node, None]:
+        """Return the first following sibling div with the given class, or None."""
+        sibling = node.next
+        while sibling is not None:
+            if sibling.tag == 'div' and class_name in (sibling.attributes.get('class') or '').split():
+                return sibling
+            sibling = sibling.next
+        return None
+
     def _clean_genre_text(self, genre_text: str) -> str:
         """Clean the genre text by removing 'gatunek:' and 'kategoria wiekowa:', and trimming any extra spaces."""
-        # Remove 'gatunek:' if present
-        if "gatunek:" in genre_text:
-            genre_text = genre_text.split("gatunek:")[1].strip()
-
-        # Remove 'kategoria wiekowa:' if present
-        if "kategoria wiekowa:" in genre_text:
-            genre_text = genre_text.split("kategoria wiekowa:")[0].strip()
-
-        # Remove 'czas trwania:' and everything after it
-        if "czas trwania:" in genre_text:
-            genre_text = genre_text.split("czas trwania:")[0].strip()
-
-        return genre_text
+        # One precompiled search instead of three scan-and-split passes:
+        # take the text after 'gatunek:' (if present) up to the first
+        # 'kategoria wiekowa:' / 'czas trwania:' marker.
+        match = _GENRE_RE.search(genre_text)
+        return match.group('genre').strip() if match else genre_text.strip()
 
     def _clean_production_text(self, production_text: str) -> Tuple[str, str]:
         """Extract countries and year separately from production text."""
         if "produkcja:" in production_text.lower():
             production_text = production_text.replace("produkcja:", "").strip()
 
-        # Regular expression to extract the year (assuming it's always a 4-digit number at the end)
-        year_match = re.search(r'(\d{4})$', production_text)
+        # The year is assumed to be a 4-digit number at the end
+        year_match = _YEAR_RE.search(production_text)
         year = year_match.group(1) if year_match else "Unknown"
 
         # Extract country names (removing the year part)
-        countries = production_text.replace(year, "").strip() if year_match else production_text
+        countries = production_text[:year_match.start()].strip() if year_match else production_text
 
         return countries, year
 
-    def _fetch_genre(self, soup: BeautifulSoup) -> Tuple[str, Union[BeautifulSoup, None]]:
+    def _fetch_genre(self, tree: HTMLParser) -> Tuple[str, Union[Node, None]]:
         """Fetch and return the movie genre from the movie page."""
-        genre_h4 = next((h4 for h4 in soup.find_all('h4') if 'gatunek' in h4.get_text().lower()), None)
+        genre_h4 = next((h4 for h4 in tree.css('h4') if 'gatunek' in h4.text().lower()), None)
         if genre_h4:
-            genre_text = genre_h4.get_text().strip()
-            return self._clean_genre_text(genre_text), genre_h4.find_parent()
+            genre_text = genre_h4.text().strip()
+            return self._clean_genre_text(genre_text), genre_h4.parent
         return "Genre not found", None
 
-    def _fetch_description(self, soup: BeautifulSoup, parent_div: Union[BeautifulSoup, None] = None) -> str:
+    def _fetch_description(self, tree: HTMLParser, parent_div: Union[Node, None] = None) -> str:
         """Fetch and return the movie description from the movie page."""
         if parent_div:
-            paragraphs = [p.text.strip() for p in parent_div.find_all('p') if p.text.strip()]
+            paragraphs = [p.text().strip() for p in parent_div.css('p') if p.text().strip()]
             return "\n".join(paragraphs) if paragraphs else "Description not found"
-        description_h4 = next((h4 for h4 in soup.find_all('h4') if 'opis' in h4.get_text().lower()), None)
+        description_h4 = next((h4 for h4 in tree.css('h4') if 'opis' in h4.text().lower()), None)
         if description_h4:
-            parent_div = description_h4.find_parent()
+            parent_div = description_h4.parent
             if parent_div:
-                paragraphs = [p.text.strip() for p in parent_div.find_all('p') if p.text.strip()]
+                paragraphs = [p.text().strip() for p in parent_div.css('p') if p.text().strip()]
                 return "\n".join(paragraphs) if paragraphs else "Description not found"
         return "Description not found"
 
-    def _fetch_production(self, soup: BeautifulSoup) -> Tuple[str, str]:
+    def _fetch_production(self, tree: HTMLParser) -> Tuple[str, str]:
         """Fetch and return the production details from the movie page."""
         # Look for any divs that might contain production information
-        production_divs = soup.find_all('div', class_='f4 crrow')
-        for div in production_divs:
-            if 'produkcja:' in div.text.lower():  # Check if 'produkcja' is mentioned in the div
-                production = div.text.strip()
+        for div in tree.css('div.f4.crrow'):
+            if 'produkcja:' in div.text().lower():  # Check if 'produkcja' is mentioned in the div
+                production = div.text().strip()
                 countries, year = self._clean_production_text(production)
                 return countries, year
         return "Unknown", "Unknown"
 
-    def _fetch_movie_details(self, movie: Dict[str, Union[str, Dict[str, List[str]]]]) -> None:
+    async def _fetch_movie_details(self, session: aiohttp.ClientSession,
+                                   movie: Dict[str, Union[str, Dict[str, List[str]]]]) -> None:
         """Fetch the genre, description, and production details for a movie."""
         self.logger.info(f"Fetching details for: {movie['title']}")
-        response = requests.get(movie['link'], headers=self.headers)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Fetch genre and description
-            genre, parent_div = self._fetch_genre(soup)
-            description = self._fetch_description(soup, parent_div if genre != "Genre not found" else None)
-
-            # Fetch production
-            countries, year = self._fetch_production(soup)
-
-            # Update movie details with genre, description, and production
-            self.movies[movie['title']].update({
-                "genre": genre,
-                "description": description,
-                "countries": countries,
-                "year": year
-            })
-
-            # Save the movie to the database with the new production info
-            movie_id = self.db.save_movie(movie['title'], genre, description, year, countries)
-            self.logger.info(f"Fetched details for: {movie['title']}")
-            # Save the movie screening times in the db
-            screenings = movie.get("screenings", {})
-            self.db.save_screenings(movie_id, screenings)
-        else:
-            self.logger.error(f"Failed to fetch movie page for {movie['title']}. Status code: {response.status_code}")
+        link = movie['link']
+        body = self._page_cache.get(link)
+        if body is None:
+            body = await self._afetch(session, link)
+            if body is None:
+                self.logger.error(f"Failed to fetch movie page for {movie['title']}")
+                return
+            self._page_cache[link] = body
+
+        # Tree construction is CPU-heavy; keep it off the event loop.
+        loop = asyncio.get_running_loop()
+        tree = await loop.run_in_executor(None, HTMLParser, body)
+
+        # Fetch genre and description
+        genre, parent_div = self._fetch_genre(tree)
+        description = self._fetch_description(tree, parent_div if genre != "Genre not found" else None)
+
+        # Fetch production
+        countries, year = self._fetch_production(tree)
+
+        # Update movie details with genre, description, and production.
+        # Database writes happen later, after the event loop finishes.
+        self.movies[movie['title']].update({
+            "genre": genre,
+            "description": description,
+            "countries": countries,
+            "year": year
+        })
+        self.logger.info(f"Fetched details for: {movie['title']}")
+
+    def _save_movies(self) -> None:
+        """Persist fetched movie details and screenings to the database."""
+        records = [
+            (movie['title'], movie['genre'], movie['description'], movie['year'],
+             movie['countries'], movie.get("screenings", {}))
+            for movie in self.movies.values()
+            if "genre" in movie  # skip movies whose details fetch failed
+        ]
+        self.db.bulk_ingest(records)
+
+    async def _scrape(self, days: int) -> None:
+        """Run the fetch pipeline: all date pages, then all detail pages."""
+        # Query the known titles once for the whole run instead of
+        # re-reading the movies table for every date. Year is not known
+        # at parse time, so key on title only.
+        existing_titles = {title for title, _ in self._get_existing_movies()}
+
+        dates = self._get_dates_range(days)
+        connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=10),
+            read_bufsize=2 ** 18  # 256 KiB: fewer reads per page than the 64 KiB default
+        ) as session:
+            await asyncio.gather(
+                *(self._parse_movies(session, date, existing_titles)
+                  for date in dates)
+            )
+
+            # Concurrent parsing inserts screenings in network-completion
+            # order; rebuild each dict keyed by the chronological dates list
+            # so emails render the schedule in date order again.
+            for movie in self.movies.values():
+                screenings = movie["screenings"]
+                movie["screenings"] = {date: screenings[date] for date in dates if date in screenings}
+            # Fetch each detail URL at most once, even if several schedule
+            # entries point at the same page. Movies already in the database
+            # never get a detail GET at all — _parse_movies filters them when
+            # collecting, and this guard keeps it that way even if an entry
+            # slips into self.movies by another route.
+            seen_links: Set[str] = set()
+            detail_tasks = []
+            for movie in list(self.movies.values()):
+                if movie['title'] in existing_titles or movie['link'] in seen_links:
+                    continue
+                seen_links.add(movie['link'])
+                detail_tasks.append(self._fetch_movie_details(session, movie))
+            await asyncio.gather(*detail_tasks)
 
     def _get_movies_schedule(self, days: int) -> Dict[str, Dict[str, Union[str, Dict[str, List[str]]]]]:
         """Private method to get the movie schedule."""
-        for date in self._get_dates_range(days):
-            self._parse_movies(date)
+        asyncio.run(self._scrape(days))
 
-        for movie in self.movies.values():
-            self._fetch_movie_details(movie)
+        # The SQLite writes happen here, outside the event loop.
+        self._save_movies()
 
         return self.movies
 
@@ -219,8 +292,8 @@ class KinoScraper:
 
         # If we have new movies, send an email
         if new_movies:
-            email_sender = EmailSender()
-            email_sender.send_email(new_movies, num_days=num_days)
+            with EmailSender() as email_sender:
+                email_sender.send_email(new_movies, num_days=num_days)
 
     def close_db(self) -> None:
         """Close the database connection."""
@@ -239,8 +312,9 @@ def main() -> None:
     # Send an email with new movies
     scraper.send_new_movies_email(num_days=num_days)
 
-    # Log the collected movie details
-    movies_list_json = json.dumps(movies_list, indent=4, ensure_ascii=False)
+    # Log the collected movie details (orjson serializes in C and emits
+    # utf-8 directly, so no ensure_ascii=False pass is needed)
+    movies_list_json = orjson.dumps(movies_list, option=orjson.OPT_INDENT_2).decode()
     scraper.movies_logger.info("Collected movie details:\n%s", movies_list_json)
 
     # Close the database connection after processing